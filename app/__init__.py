@@ -7,6 +7,7 @@ __all__ = [
     "tools",
     "executor",
     "pipeline",
+    "cli",
 ]
 
 
@@ -0,0 +1,126 @@
+from __future__ import annotations
+import argparse
+import json
+import os
+import sys
+
+# Keep this module import-light: pandas, pydantic and openai are only loaded
+# by the subcommand that needs them.
+
+DEFAULT_DATASET = "data/sample_events.csv"
+
+
+def _load_env() -> None:
+    # Load .env BEFORE importing modules that read env vars
+    try:
+        from dotenv import find_dotenv, load_dotenv
+    except ImportError:
+        return
+    # Look for .env from the working directory (cron / serverless runs), not from the package.
+    # Unlike streamlit_app, variables set by the scheduler/process win over .env.
+    load_dotenv(find_dotenv(usecwd=True), override=False)
+
+
+def _get_plan(question: str, rule_based: bool):
+    from .planner_llm import get_plan, rule_based_plan
+    return rule_based_plan(question) if rule_based else get_plan(question)
+
+
+def _execute(args: argparse.Namespace):
+    if args.store:
+        from .result_store import ResultStore, reanalyze
+        store = ResultStore(args.store, verify_prefix=args.verify_store)
+    else:
+        store = None
+
+    if args.plan_file:
+        from .schemas import Plan
+        from .executor import execute_plan
+        from .tools import load_dataset
+
+        with open(args.plan_file, encoding="utf-8") as f:
+            plan = Plan.model_validate_json(f.read())
+        if store is not None:
+            return reanalyze(plan, args.dataset, store)
+        return execute_plan(plan, load_dataset(args.dataset))
+
+    if store is not None:
+        from .pipeline import run_incremental
+        _, result = run_incremental(args.question, args.dataset, store, use_llm=not args.rule_based)
+        return result
+
+    from .pipeline import run
+    _, _, result = run(args.question, args.dataset, use_llm=not args.rule_based)
+    return result
+
+
+def cmd_plan(args: argparse.Namespace) -> int:
+    plan = _get_plan(args.question, args.rule_based)
+    print(plan.model_dump_json(indent=2))
+    return 0
+
+
+def cmd_execute(args: argparse.Namespace) -> int:
+    result = _execute(args)
+    print(result.model_dump_json(indent=2))
+    return 0
+
+
+def cmd_narrate(args: argparse.Namespace) -> int:
+    if args.result_file:
+        from .schemas import FinalResult
+
+        with open(args.result_file, encoding="utf-8") as f:
+            result = FinalResult.model_validate_json(f.read())
+    else:
+        result = _execute(args)
+
+    from .narrator_llm import narrate
+    try:
+        print(narrate(result))
+    except Exception as e:
+        print(f"Narration failed: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(prog="python -m app", description="Business Question Decomposer (Plan → Execute → Narrate)")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    def add_common(sp: argparse.ArgumentParser, dataset: bool = True) -> None:
+        sp.add_argument("question", nargs="?", default="Why did conversion drop last week?")
+        sp.add_argument("--rule-based", action="store_true", help="skip the LLM planner and use the rule-based plan")
+        if dataset:
+            sp.add_argument("--dataset", default=None, help=f"defaults to DATASET_PATH (process env first, then .env), else {DEFAULT_DATASET}")
+            sp.add_argument("--plan-file", default=None, help="execute a saved Plan JSON instead of planning")
+            sp.add_argument("--store", default=None, help="result store directory; re-runs only read rows appended since last time")
+            sp.add_argument("--verify-store", action="store_true", help="hash the whole file to detect edits before the appended rows")
+
+    sp = sub.add_parser("plan", help="print the Plan JSON for a question")
+    add_common(sp, dataset=False)
+    sp.set_defaults(func=cmd_plan)
+
+    sp = sub.add_parser("execute", help="plan and execute, print the FinalResult JSON")
+    add_common(sp)
+    sp.set_defaults(func=cmd_execute)
+
+    sp = sub.add_parser("narrate", help="plan, execute and print the executive summary")
+    add_common(sp)
+    sp.add_argument("--result-file", default=None, help="narrate a saved FinalResult JSON instead of executing")
+    sp.set_defaults(func=cmd_narrate)
+
+    return p
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    _load_env()
+    # Resolved after .env is loaded so DATASET_PATH from .env is honoured
+    if getattr(args, "dataset", "") is None:
+        args.dataset = os.getenv("DATASET_PATH", DEFAULT_DATASET)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
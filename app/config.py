@@ -1,9 +1,25 @@
 from pydantic import BaseModel
 import os
 
+def _optional_int_env(name: str) -> int | None:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return None
+    try:
+        value = int(raw)
+    except ValueError:
+        value = None
+    if value is None or value < 0:
+        raise RuntimeError(f"{name} must be a non-negative integer, got {raw!r}.")
+    return value
+
 class Settings(BaseModel):
     openai_api_key: str | None = os.getenv("OPENAI_API_KEY")
     openai_model: str = os.getenv("OPENAI_MODEL", "gpt-4.1-mini")
+    # Optional override, e.g. a local OpenAI-compatible stand-in server
+    openai_base_url: str | None = os.getenv("OPENAI_BASE_URL")
+    # SDK retries on 429/5xx; unset keeps the openai default (2)
+    openai_max_retries: int | None = _optional_int_env("OPENAI_MAX_RETRIES")
 
     dataset_path: str = os.getenv("DATASET_PATH", "data/sample_events.csv")
 
@@ -61,7 +61,11 @@ def _evaluate_verdicts(evidence: Evidence) -> list[HypothesisVerdict]:
 
     return verdicts
 
-def execute_plan(plan: Plan, df):
+def execute_plan(plan: Plan, df, sanity: dict | None = None):
+    """
+    `df` may be raw rows or additive daily aggregates (see result_store); in the
+    latter case the sanity checks are precomputed and passed in as `sanity`.
+    """
     ev = Evidence()
 
     period_prev = None
@@ -72,7 +76,7 @@ def execute_plan(plan: Plan, df):
             raise ValueError(f"Tool not allowed: {step.tool_name}")
 
         if step.tool_name == "sanity_check_data":
-            ev.sanity = tools.sanity_check_data(df)
+            ev.sanity = sanity if sanity is not None else tools.sanity_check_data(df)
 
         elif step.tool_name == "resolve_period":
             prev, cur = tools.resolve_period(step.args.get("question_text", plan.question), df)
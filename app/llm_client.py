@@ -1,11 +1,19 @@
 from __future__ import annotations
 import os
-from openai import OpenAI
+from typing import TYPE_CHECKING
 from .config import settings
 
-def get_client() -> OpenAI:
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+def get_client(base_url: str | None = None) -> OpenAI:
     # Read at call-time to avoid early-import/ordering issues
     api_key = os.getenv("OPENAI_API_KEY") or settings.openai_api_key
     if not api_key:
         raise RuntimeError("OPENAI_API_KEY is missing. Put it in .env or environment variables.")
-    return OpenAI(api_key=api_key)
\ No newline at end of file
+    base_url = base_url or os.getenv("OPENAI_BASE_URL") or settings.openai_base_url
+    # Imported here so rule-based / keyless runs never pay for the openai SDK
+    from openai import OpenAI
+    max_retries = settings.openai_max_retries
+    kwargs = {"max_retries": max_retries} if max_retries is not None else {}
+    return OpenAI(api_key=api_key, base_url=base_url or None, **kwargs)
\ No newline at end of file
@@ -1,10 +1,26 @@
 from __future__ import annotations
-from .planner_llm import get_plan
-from .executor import execute_plan
-from .tools import load_dataset
 
-def run(question: str, dataset_path: str):
+# Heavy modules (pandas, pydantic, openai) are imported inside run() so that
+# `import app.pipeline` stays cheap for the CLI and short-lived invocations.
+
+def run(question: str, dataset_path: str, use_llm: bool = True):
+    from .planner_llm import get_plan, rule_based_plan
+    from .executor import execute_plan
+    from .tools import load_dataset
+
     df = load_dataset(dataset_path)
-    plan = get_plan(question)
+    plan = get_plan(question) if use_llm else rule_based_plan(question)
     result = execute_plan(plan, df)
-    return df, plan, result
\ No newline at end of file
+    return df, plan, result
+
+def run_incremental(question: str, dataset_path: str, store, use_llm: bool = True):
+    """
+    Like run(), but reuses the aggregates kept in `store` (a result_store.ResultStore)
+    so that only rows appended since the last analysis are read.
+    """
+    from .planner_llm import get_plan, rule_based_plan
+    from .result_store import reanalyze
+
+    plan = get_plan(question) if use_llm else rule_based_plan(question)
+    result = reanalyze(plan, dataset_path, store)
+    return plan, result
@@ -58,9 +58,14 @@ def plan_with_llm(question: str) -> Plan:
     data = json.loads(text)
     return Plan.model_validate(data)
 
-def get_plan(question: str) -> Plan:
+def get_plan_with_fallback(question: str) -> tuple[Plan, bool]:
+    """Returns (plan, used_fallback)."""
     # Try LLM once; fallback to rule plan
     try:
-        return plan_with_llm(question)
+        return plan_with_llm(question), False
     except Exception:
-        return rule_based_plan(question)
\ No newline at end of file
+        return rule_based_plan(question), True
+
+def get_plan(question: str) -> Plan:
+    plan, _ = get_plan_with_fallback(question)
+    return plan
\ No newline at end of file
@@ -0,0 +1,230 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass, asdict
+from pathlib import Path
+
+import pandas as pd
+
+from .schemas import Plan, FinalResult
+from .executor import execute_plan
+from . import tools
+
+# Bytes hashed at the start and just before the end of the previously seen file.
+# The dataset is assumed to be append-only: matching blocks + a larger size means
+# "same rows plus new ones". An edit elsewhere in a file larger than two blocks
+# is NOT detected by this check; ResultStore(verify_prefix=True) hashes the whole
+# previously seen prefix instead, at the cost of reading the full file each run.
+_FINGERPRINT_BLOCK = 64 * 1024
+_READ_CHUNK = 1024 * 1024
+
+_METRICS = ["sessions", "conversions", *tools.FUNNEL_STEPS]
+
+
+def _sha(f, start: int, end: int) -> str:
+    h = hashlib.sha256()
+    f.seek(start)
+    remaining = max(end - start, 0)
+    while remaining:
+        chunk = f.read(min(remaining, _READ_CHUNK))
+        if not chunk:
+            break
+        h.update(chunk)
+        remaining -= len(chunk)
+    return h.hexdigest()
+
+
+@dataclass(frozen=True)
+class DatasetFingerprint:
+    size: int
+    mtime_ns: int
+    head_sha: str
+    tail_sha: str
+    full_sha: str | None = None  # whole file, only computed with full=True
+
+    @classmethod
+    def of(cls, path: str, full: bool = False) -> "DatasetFingerprint":
+        st = os.stat(path)
+        with open(path, "rb") as f:
+            head = _sha(f, 0, min(_FINGERPRINT_BLOCK, st.st_size))
+            tail = _sha(f, max(0, st.st_size - _FINGERPRINT_BLOCK), st.st_size)
+            whole = _sha(f, 0, st.st_size) if full else None
+        return cls(st.st_size, st.st_mtime_ns, head, tail, whole)
+
+    def is_prefix_of(self, path: str, current: "DatasetFingerprint", verify: bool = False) -> bool:
+        """
+        True if `path` (now `current`) is this file with rows appended.
+        With `verify`, the whole old prefix must hash to `full_sha`.
+        """
+        if current.size <= self.size or self.size == 0:
+            return False
+        if verify and self.full_sha is None:
+            return False
+        with open(path, "rb") as f:
+            if _sha(f, 0, min(_FINGERPRINT_BLOCK, self.size)) != self.head_sha:
+                return False
+            if _sha(f, max(0, self.size - _FINGERPRINT_BLOCK), self.size) != self.tail_sha:
+                return False
+            if verify and _sha(f, 0, self.size) != self.full_sha:
+                return False
+            # New rows must start on a fresh line
+            f.seek(self.size - 1)
+            return f.read(1) == b"\n"
+
+
+@dataclass
+class StoredAnalysis:
+    fingerprint: DatasetFingerprint
+    cube: pd.DataFrame  # additive daily aggregates by date (+ plan segment columns)
+    sanity_parts: dict
+
+
+def _segment_cols(plan: Plan) -> list[str]:
+    cols: list[str] = []
+    for step in plan.execution_steps:
+        if step.tool_name == "segment_impact":
+            c = step.args["segment_col"]
+            if c not in cols:
+                cols.append(c)
+    return cols
+
+
+def build_cube(df: pd.DataFrame, segment_cols: list[str]) -> pd.DataFrame:
+    """
+    Sum the additive metrics per date and segment combination. The tools only sum
+    these columns within a period, so they return the same evidence on the cube.
+    """
+    metrics = [c for c in _METRICS if c in df.columns]
+    return df.groupby(["date", *segment_cols], dropna=False, as_index=False)[metrics].sum()
+
+
+def merge_cubes(a: pd.DataFrame, b: pd.DataFrame, segment_cols: list[str]) -> pd.DataFrame:
+    if b.empty:
+        return a
+    both = pd.concat([a, b], ignore_index=True)
+    return both.groupby(["date", *segment_cols], dropna=False, as_index=False).sum()
+
+
+def _prune(cube: pd.DataFrame, plan: Plan) -> pd.DataFrame:
+    """
+    Drop days before the earliest resolved period. The anchor (max date) only
+    moves forward as rows are appended, so those days are never needed again.
+    """
+    starts = []
+    for step in plan.execution_steps:
+        if step.tool_name == "resolve_period" and not cube.empty:
+            prev, _ = tools.resolve_period(step.args.get("question_text", plan.question), cube)
+            starts.append(prev.start)
+    if not starts:
+        return cube
+    return cube[cube["date"] >= min(starts)].reset_index(drop=True)
+
+
+class ResultStore:
+    """
+    Keeps the additive aggregates behind each analysed (question, plan) pair,
+    together with the fingerprint of the dataset they were computed from.
+    With `root=None` the store is in-memory only; otherwise one JSON file per key.
+    `verify_prefix=True` hashes the whole previously seen file on each run so that
+    edits anywhere (not only in the first/last block) force a full recompute.
+    """
+
+    def __init__(self, root: str | None = None, verify_prefix: bool = False):
+        self.root = Path(root) if root else None
+        self.verify_prefix = verify_prefix
+        self._mem: dict[str, StoredAnalysis] = {}
+        self._lock = threading.Lock()
+        if self.root:
+            self.root.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(plan: Plan) -> str:
+        payload = json.dumps({"question": plan.question, "plan": plan.model_dump()}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def get(self, key: str) -> StoredAnalysis | None:
+        with self._lock:
+            if key in self._mem:
+                return self._mem[key]
+        if not self.root or not self._path(key).exists():
+            return None
+
+        data = json.loads(self._path(key).read_text(encoding="utf-8"))
+        cube = pd.DataFrame(data["cube"]["rows"], columns=data["cube"]["columns"])
+        cube["date"] = pd.to_datetime(cube["date"], format="ISO8601")
+        entry = StoredAnalysis(DatasetFingerprint(**data["fingerprint"]), cube, data["sanity_parts"])
+        with self._lock:
+            self._mem[key] = entry
+        return entry
+
+    def put(self, key: str, entry: StoredAnalysis) -> None:
+        with self._lock:
+            self._mem[key] = entry
+        if not self.root:
+            return
+
+        cube = entry.cube.copy()
+        # isoformat keeps the UTC offset and sub-second parts, so dates round-trip exactly
+        cube["date"] = cube["date"].map(lambda t: t.isoformat())
+        split = cube.to_dict(orient="split", index=False)
+        data = {
+            "fingerprint": asdict(entry.fingerprint),
+            "cube": {"columns": split["columns"], "rows": split["data"]},
+            "sanity_parts": entry.sanity_parts,
+        }
+        tmp = self._path(key).with_suffix(".tmp")
+        tmp.write_text(json.dumps(data), encoding="utf-8")
+        tmp.replace(self._path(key))
+
+
+def _read_delta(prev: StoredAnalysis, dataset_path: str, end: int, seg_cols: list[str]) -> pd.DataFrame | None:
+    """
+    Rows appended after `prev`, with segment columns typed like the stored cube so
+    that e.g. an all-numeric chunk of a string column does not form separate groups.
+    None if the new rows do not fit those types (a full recompute is needed).
+    """
+    dtype = {c: prev.cube[c].dtype for c in seg_cols if c in prev.cube.columns}
+    try:
+        return tools.load_dataset_rows(dataset_path, prev.fingerprint.size, end, dtype=dtype)
+    except (ValueError, TypeError):
+        return None
+
+
+def reanalyze(plan: Plan, dataset_path: str, store: ResultStore) -> FinalResult:
+    """
+    Execute `plan` against the CSV at `dataset_path`, reusing stored aggregates.
+
+    - unchanged dataset: evidence is recomputed from the stored aggregates only
+    - rows appended since last time: only the new bytes are read and aggregated
+    - otherwise (first run, edited file, new rows that do not fit the stored
+      column types): full execute_plan on the raw rows
+    """
+    key = store.key(plan)
+    seg_cols = _segment_cols(plan)
+    fp = DatasetFingerprint.of(dataset_path, full=store.verify_prefix)
+    prev = store.get(key)
+
+    new_rows = None
+    if prev is not None and prev.fingerprint != fp and prev.fingerprint.is_prefix_of(dataset_path, fp, verify=store.verify_prefix):
+        new_rows = _read_delta(prev, dataset_path, fp.size, seg_cols)
+
+    if prev is not None and prev.fingerprint == fp:
+        cube, parts = prev.cube, prev.sanity_parts
+    elif new_rows is not None:
+        cube = merge_cubes(prev.cube, build_cube(new_rows, seg_cols), seg_cols)
+        parts = tools.merge_sanity_parts(prev.sanity_parts, tools.sanity_parts(new_rows))
+    else:
+        # Read up to the fingerprinted size so that rows appended meanwhile are picked up next time
+        df = tools.load_dataset_rows(dataset_path, end=fp.size)
+        result = execute_plan(plan, df)
+        store.put(key, StoredAnalysis(fp, _prune(build_cube(df, seg_cols), plan), tools.sanity_parts(df)))
+        return result
+
+    result = execute_plan(plan, cube, sanity=tools.sanity_from_parts(parts))
+    store.put(key, StoredAnalysis(fp, _prune(cube, plan), parts))
+    return result
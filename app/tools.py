@@ -1,8 +1,12 @@
 from __future__ import annotations
+import io
 import pandas as pd
 import numpy as np
 from dataclasses import dataclass
 
+REQUIRED_COLUMNS = ["date","sessions","conversions","step_view_product","step_add_to_cart","step_checkout","step_purchase"]
+FUNNEL_STEPS = ["step_view_product","step_add_to_cart","step_checkout","step_purchase"]
+
 @dataclass(frozen=True)
 class Period:
     start: pd.Timestamp
@@ -13,6 +17,29 @@ def load_dataset(path: str) -> pd.DataFrame:
     df["date"] = pd.to_datetime(df["date"])
     return df
 
+def load_dataset_rows(path: str, start: int | None = None, end: int | None = None, dtype: dict | None = None) -> pd.DataFrame:
+    """
+    Read only the rows stored between byte offsets [start, end) of the CSV.
+    `start` must be at a line boundary (defaults to just after the header line).
+    Pass `dtype` to keep a chunk's columns consistent with previously read rows,
+    since type inference would otherwise only see this chunk.
+    """
+    # Parsed like load_dataset does (quoting, BOM)
+    header = list(pd.read_csv(path, nrows=0).columns)
+    with open(path, "rb") as f:
+        f.readline()
+        if start is not None:
+            f.seek(start)
+        start = f.tell()
+        data = f.read() if end is None else f.read(max(end - start, 0))
+
+    if not data.strip():
+        df = pd.DataFrame(columns=header)
+    else:
+        df = pd.read_csv(io.BytesIO(data), header=None, names=header, dtype=dtype)
+    df["date"] = pd.to_datetime(df["date"])
+    return df
+
 def resolve_period(question_text: str, df: pd.DataFrame) -> tuple[Period, Period]:
     """
     Phase 1: supports 'last week' only.
@@ -74,15 +101,13 @@ def compute_kpis(df: pd.DataFrame, period_a: Period, period_b: Period, segment:
     }
 
 def funnel_breakdown(df: pd.DataFrame, period_a: Period, period_b: Period) -> dict:
-    steps = ["step_view_product", "step_add_to_cart", "step_checkout", "step_purchase"]
-
     def agg(d: pd.DataFrame) -> dict:
-        totals = {s: int(d[s].sum()) for s in steps}
+        totals = {s: int(d[s].sum()) for s in FUNNEL_STEPS}
         rates = {}
-        for i in range(1, len(steps)):
-            prev = totals[steps[i-1]]
-            cur = totals[steps[i]]
-            rates[f"{steps[i-1]}→{steps[i]}"] = float(cur / prev) if prev > 0 else None
+        for i in range(1, len(FUNNEL_STEPS)):
+            prev = totals[FUNNEL_STEPS[i-1]]
+            cur = totals[FUNNEL_STEPS[i]]
+            rates[f"{FUNNEL_STEPS[i-1]}→{FUNNEL_STEPS[i]}"] = float(cur / prev) if prev > 0 else None
         return {"totals": totals, "rates": rates}
 
     a = agg(_filter_period(df, period_a))
@@ -131,22 +156,43 @@ def segment_impact(df: pd.DataFrame, period_a: Period, period_b: Period, segment
     rows = m.to_dict(orient="records")
     return {"segment_col": segment_col, "rows": rows}
 
-def sanity_check_data(df: pd.DataFrame) -> dict:
-    checks = {}
+def sanity_parts(df: pd.DataFrame) -> dict:
+    """
+    Additive inputs of sanity_check_data: parts of two row chunks can be
+    combined with merge_sanity_parts.
+    """
+    negatives = {}
+    for c in REQUIRED_COLUMNS[1:]:
+        if c in df.columns:
+            negatives[c] = int((df[c] < 0).sum())
 
-    required = ["date","sessions","conversions","step_view_product","step_add_to_cart","step_checkout","step_purchase"]
-    missing = [c for c in required if c not in df.columns]
-    checks["missing_required_columns"] = missing
+    agg = df[FUNNEL_STEPS].sum()
+    return {
+        "columns": list(df.columns),
+        "negative_values": negatives,
+        "funnel_totals": {s: agg[s].item() for s in FUNNEL_STEPS},
+    }
 
-    checks["negative_values"] = {}
-    for c in required[1:]:
-        if c in df.columns:
-            checks["negative_values"][c] = int((df[c] < 0).sum())
+def merge_sanity_parts(a: dict, b: dict) -> dict:
+    return {
+        "columns": a["columns"],
+        "negative_values": {c: a["negative_values"].get(c, 0) + b["negative_values"].get(c, 0) for c in a["negative_values"]},
+        "funnel_totals": {s: a["funnel_totals"][s] + b["funnel_totals"][s] for s in FUNNEL_STEPS},
+    }
+
+def sanity_from_parts(parts: dict) -> dict:
+    checks = {}
+
+    checks["missing_required_columns"] = [c for c in REQUIRED_COLUMNS if c not in parts["columns"]]
+    checks["negative_values"] = dict(parts["negative_values"])
 
     # basic funnel monotonicity heuristic (aggregated)
-    agg = df[["step_view_product","step_add_to_cart","step_checkout","step_purchase"]].sum()
+    agg = parts["funnel_totals"]
     checks["funnel_monotonicity_ok"] = bool(
         (agg["step_view_product"] >= agg["step_add_to_cart"] >= agg["step_checkout"] >= agg["step_purchase"])
     )
 
-    return checks
\ No newline at end of file
+    return checks
+
+def sanity_check_data(df: pd.DataFrame) -> dict:
+    return sanity_from_parts(sanity_parts(df))
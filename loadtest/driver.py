@@ -0,0 +1,190 @@
+from __future__ import annotations
+import argparse
+import json
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from pathlib import Path
+
+from app import planner_llm
+from app.config import settings
+from app.executor import execute_plan
+from app.narrator_llm import narrate
+from app.tools import load_dataset
+
+DEFAULT_CORPUS = Path(__file__).with_name("questions.txt")
+
+
+@dataclass
+class Sample:
+    question: str
+    total_s: float
+    plan_s: float
+    execute_s: float
+    narrate_s: float
+    planner_fallback: bool
+    narrator_fallback: bool
+    error: str | None = None
+
+
+def run_once(question: str, dataset_path: str) -> Sample:
+    """
+    Same stages as pipeline.run + narrate, timed separately.
+    """
+    t0 = time.perf_counter()
+    plan_s = execute_s = narrate_s = 0.0
+    planner_fallback = narrator_fallback = False
+    try:
+        df = load_dataset(dataset_path)
+
+        t = time.perf_counter()
+        # Same code path as planner_llm.get_plan, which pipeline.run uses
+        plan, planner_fallback = planner_llm.get_plan_with_fallback(question)
+        plan_s = time.perf_counter() - t
+
+        t = time.perf_counter()
+        result = execute_plan(plan, df)
+        execute_s = time.perf_counter() - t
+
+        t = time.perf_counter()
+        try:
+            narrate(result)
+        except Exception:
+            # streamlit_app shows evidence only in this case
+            narrator_fallback = True
+        narrate_s = time.perf_counter() - t
+    except Exception as e:
+        return Sample(question, time.perf_counter() - t0, plan_s, execute_s, narrate_s,
+                      planner_fallback, narrator_fallback, error=f"{type(e).__name__}: {e}")
+
+    return Sample(question, time.perf_counter() - t0, plan_s, execute_s, narrate_s,
+                  planner_fallback, narrator_fallback)
+
+
+def percentile(values: list[float], q: float) -> float | None:
+    """Nearest-rank percentile, q in [0, 100]."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    k = max(math.ceil(q / 100 * len(ordered)) - 1, 0)
+    return ordered[k]
+
+
+def summarize(samples: list[Sample], wall_s: float, concurrency: int) -> dict:
+    n = len(samples)
+    ok = [s for s in samples if s.error is None]
+
+    def lat(attr: str) -> dict:
+        vals = [getattr(s, attr) * 1000 for s in ok]
+        return {
+            "mean_ms": (sum(vals) / len(vals)) if vals else None,
+            "p50_ms": percentile(vals, 50),
+            "p90_ms": percentile(vals, 90),
+            "p99_ms": percentile(vals, 99),
+            "max_ms": max(vals) if vals else None,
+        }
+
+    return {
+        "requests": n,
+        "concurrency": concurrency,
+        "wall_s": wall_s,
+        "throughput_rps": (n / wall_s) if wall_s > 0 else None,
+        "errors": n - len(ok),
+        "planner_fallback_rate": (sum(s.planner_fallback for s in ok) / len(ok)) if ok else None,
+        "narrator_fallback_rate": (sum(s.narrator_fallback for s in ok) / len(ok)) if ok else None,
+        "latency": {
+            "total": lat("total_s"),
+            "plan": lat("plan_s"),
+            "execute": lat("execute_s"),
+            "narrate": lat("narrate_s"),
+        },
+    }
+
+
+def load_corpus(path: str | Path) -> list[str]:
+    lines = Path(path).read_text(encoding="utf-8").splitlines()
+    return [ln.strip() for ln in lines if ln.strip() and not ln.lstrip().startswith("#")]
+
+
+def run_load(questions: list[str], dataset_path: str, concurrency: int = 4, requests: int | None = None) -> tuple[list[Sample], dict]:
+    """Replay the corpus (cycling if requests > len(questions)) at the given concurrency."""
+    if not questions:
+        raise ValueError("Question corpus is empty")
+    n = requests or len(questions)
+    batch = [questions[i % len(questions)] for i in range(n)]
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(lambda q: run_once(q, dataset_path), batch))
+    wall_s = time.perf_counter() - t0
+    return samples, summarize(samples, wall_s, concurrency)
+
+
+def _print_report(report: dict) -> None:
+    def fmt(v):
+        return "-" if v is None else f"{v:.1f}"
+
+    print(f"requests={report['requests']} concurrency={report['concurrency']} "
+          f"wall={report['wall_s']:.2f}s throughput={fmt(report['throughput_rps'])} req/s errors={report['errors']}")
+    for key in ("planner_fallback_rate", "narrator_fallback_rate"):
+        v = report[key]
+        print(f"{key}: {'-' if v is None else f'{v:.1%}'}")
+    if "stub" in report:
+        st = report["stub"]
+        print(f"stub: http_requests={st['requests']} injected_errors={st['errors']} malformed_plans={st['malformed']} "
+              f"(client max_retries={report['max_retries']})")
+    print(f"{'stage':<9}{'mean':>9}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}  (ms)")
+    for stage, d in report["latency"].items():
+        print(f"{stage:<9}" + "".join(f"{fmt(d[k]):>9}" for k in ("mean_ms", "p50_ms", "p90_ms", "p99_ms", "max_ms")))
+
+
+def main(argv: list[str] | None = None) -> None:
+    from .stub_server import add_stub_args, stub_config_from_args, start_in_thread
+
+    p = argparse.ArgumentParser(description="Replay a question corpus through plan → execute → narrate.")
+    p.add_argument("--corpus", default=str(DEFAULT_CORPUS))
+    p.add_argument("--dataset", default=settings.dataset_path)
+    p.add_argument("--concurrency", type=int, default=4)
+    p.add_argument("--requests", type=int, default=None, help="total requests (defaults to corpus size)")
+    p.add_argument("--base-url", default=None, help="OpenAI-compatible endpoint, e.g. http://127.0.0.1:8089/v1")
+    p.add_argument("--spawn-stub", action="store_true", help="start an in-process stub server and target it")
+    p.add_argument("--max-retries", type=int, default=None,
+                   help="openai SDK retries per call (default: OPENAI_MAX_RETRIES, else 2); retried 5xx show up as latency, not fallbacks")
+    p.add_argument("--json", action="store_true", help="print the report as JSON")
+    add_stub_args(p)
+    args = p.parse_args(argv)
+
+    srv = None
+    if args.spawn_stub:
+        srv = start_in_thread(stub_config_from_args(args))
+        args.base_url = srv.base_url
+    if args.max_retries is not None:
+        settings.openai_max_retries = args.max_retries
+    if args.base_url:
+        # get_client reads these at call-time
+        os.environ["OPENAI_BASE_URL"] = args.base_url
+        if not os.getenv("OPENAI_API_KEY"):
+            os.environ["OPENAI_API_KEY"] = "stub-key"
+
+    try:
+        samples, report = run_load(load_corpus(args.corpus), args.dataset, args.concurrency, args.requests)
+    finally:
+        if srv is not None:
+            srv.shutdown()
+            srv.server_close()
+
+    if srv is not None:
+        # Server-side view: how many HTTP calls (incl. SDK retries) hit the stub and what was injected
+        report["stub"] = srv.state.snapshot()
+        report["max_retries"] = args.max_retries if args.max_retries is not None else "default"
+
+    if args.json:
+        print(json.dumps({"report": report, "samples": [asdict(s) for s in samples]}, indent=2))
+    else:
+        _print_report(report)
+
+
+if __name__ == "__main__":
+    main()
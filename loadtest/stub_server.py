@@ -0,0 +1,215 @@
+from __future__ import annotations
+import argparse
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.planner_llm import PLANNER_SYSTEM, rule_based_plan
+
+STUB_NARRATIVE = """- Overall performance
+  - Sessions and conversions moved week over week (stub narrative).
+- Primary driver(s): funnel step between add-to-cart and checkout.
+- Segment insights
+  - Device: mobile contributes most of the change.
+  - Channel: no single channel dominates.
+  - Country: no material difference.
+- Confidence: medium — evidence is consistent but limited to one week.
+- Recommended next checks
+  - Check tracking changes around the period boundary.
+  - Inspect checkout UX on mobile."""
+
+
+@dataclass(frozen=True)
+class LatencySpec:
+    """
+    Parsed from 'fixed:MS', 'uniform:LO_MS:HI_MS' or 'lognormal:MEDIAN_MS:SIGMA'.
+    """
+    kind: str
+    a: float
+    b: float = 0.0
+
+    @classmethod
+    def parse(cls, text: str) -> "LatencySpec":
+        parts = text.split(":")
+        kind = parts[0]
+        nums = [float(p) for p in parts[1:]]
+        if kind == "fixed" and len(nums) == 1:
+            return cls(kind, nums[0])
+        if kind in ("uniform", "lognormal") and len(nums) == 2:
+            return cls(kind, nums[0], nums[1])
+        raise ValueError(f"Bad latency spec: {text!r}")
+
+    def sample_seconds(self, rng: random.Random) -> float:
+        if self.kind == "fixed":
+            ms = self.a
+        elif self.kind == "uniform":
+            ms = rng.uniform(self.a, self.b)
+        else:
+            ms = rng.lognormvariate(0.0, self.b) * self.a
+        return max(ms, 0.0) / 1000.0
+
+
+@dataclass
+class StubConfig:
+    planner_latency: LatencySpec = field(default_factory=lambda: LatencySpec("fixed", 0.0))
+    narrator_latency: LatencySpec = field(default_factory=lambda: LatencySpec("fixed", 0.0))
+    error_rate: float = 0.0      # fraction of requests answered with HTTP 500
+    malformed_rate: float = 0.0  # fraction of planner replies that are not valid Plan JSON
+    seed: int | None = None
+
+
+class _StubState:
+    def __init__(self, cfg: StubConfig):
+        self.cfg = cfg
+        self.rng = random.Random(cfg.seed)
+        self.lock = threading.Lock()
+        self.counts = {"requests": 0, "errors": 0, "malformed": 0}
+
+    def draw(self) -> float:
+        with self.lock:
+            return self.rng.random()
+
+    def bump(self, key: str) -> int:
+        with self.lock:
+            self.counts[key] += 1
+            return self.counts[key]
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return dict(self.counts)
+
+
+def _is_planner(messages: list[dict]) -> bool:
+    return any(m.get("role") == "system" and m.get("content") == PLANNER_SYSTEM for m in messages)
+
+
+def _planner_reply(messages: list[dict]) -> str:
+    user = next((m.get("content") or "" for m in messages if m.get("role") == "user"), "")
+    try:
+        question = json.loads(user).get("question", "")
+    except (ValueError, AttributeError):
+        question = user
+    return rule_based_plan(question).model_dump_json()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    server: "StubServer"
+
+    def log_message(self, format, *args):  # keep load tests quiet
+        pass
+
+    def _send_json(self, status: int, body: dict) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}", "type": "invalid_request_error"}})
+            return
+
+        length = int(self.headers.get("Content-Length") or 0)
+        req = json.loads(self.rfile.read(length) or b"{}")
+        messages = req.get("messages", [])
+
+        state = self.server.state
+        cfg = state.cfg
+        req_no = state.bump("requests")
+
+        planner = _is_planner(messages)
+        latency = cfg.planner_latency if planner else cfg.narrator_latency
+        with state.lock:
+            delay = latency.sample_seconds(state.rng)
+        time.sleep(delay)
+
+        if state.draw() < cfg.error_rate:
+            state.bump("errors")
+            self._send_json(500, {"error": {"message": "Injected stub error", "type": "server_error"}})
+            return
+
+        if planner:
+            if state.draw() < cfg.malformed_rate:
+                state.bump("malformed")
+                content = "Sure! Here is the plan you asked for."
+            else:
+                content = _planner_reply(messages)
+        else:
+            content = STUB_NARRATIVE
+
+        self._send_json(200, {
+            "id": f"chatcmpl-stub-{req_no}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": req.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        })
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], cfg: StubConfig):
+        super().__init__(address, StubHandler)
+        self.state = _StubState(cfg)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+
+def start_in_thread(cfg: StubConfig, host: str = "127.0.0.1", port: int = 0) -> StubServer:
+    """Start a stub server on a background thread; call .shutdown() when done."""
+    srv = StubServer((host, port), cfg)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv
+
+
+def add_stub_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--planner-latency", default="fixed:0", help="fixed:MS | uniform:LO:HI | lognormal:MEDIAN_MS:SIGMA")
+    p.add_argument("--narrator-latency", default="fixed:0", help="same format as --planner-latency")
+    p.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with HTTP 500")
+    p.add_argument("--malformed-rate", type=float, default=0.0, help="fraction of planner replies that are not valid JSON")
+    p.add_argument("--seed", type=int, default=None)
+
+
+def stub_config_from_args(args: argparse.Namespace) -> StubConfig:
+    return StubConfig(
+        planner_latency=LatencySpec.parse(args.planner_latency),
+        narrator_latency=LatencySpec.parse(args.narrator_latency),
+        error_rate=args.error_rate,
+        malformed_rate=args.malformed_rate,
+        seed=args.seed,
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    p = argparse.ArgumentParser(description="Local OpenAI-compatible stand-in for the planner/narrator.")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8089)
+    add_stub_args(p)
+    args = p.parse_args(argv)
+
+    srv = StubServer((args.host, args.port), stub_config_from_args(args))
+    print(f"Stub server listening on {srv.base_url} (set OPENAI_BASE_URL to this)")
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        srv.server_close()
+
+
+if __name__ == "__main__":
+    main()
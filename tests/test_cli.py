@@ -0,0 +1,53 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from app.cli import main
+
+# Generous enough for slow CI, far below the cost of importing pandas + openai
+IMPORT_BUDGET_S = 0.25
+HEAVY_MODULES = ("pandas", "numpy", "pydantic", "openai")
+
+_PROBE = """
+import json, sys, time
+t = time.perf_counter()
+import app, app.pipeline, app.cli
+elapsed = time.perf_counter() - t
+print(json.dumps({"elapsed": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+
+def test_import_time_budget():
+    out = subprocess.run([sys.executable, "-c", _PROBE], capture_output=True, text=True, check=True)
+    probe = json.loads(out.stdout)
+    assert probe["loaded"] == []
+    assert probe["elapsed"] < IMPORT_BUDGET_S
+
+
+def test_cli_execute_rule_based(capsys, monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    assert main(["execute", "Why did conversion drop last week?", "--rule-based", "--dataset", "data/sample_events.csv"]) == 0
+    result = json.loads(capsys.readouterr().out)
+    assert result["evidence"]["kpis"]["sessions"]["current"] >= 0
+    assert "rate_deltas" in result["evidence"]["funnel"]
+
+
+def test_cli_dataset_path_env_precedence(tmp_path, capsys, monkeypatch):
+    dataset = Path("data/sample_events.csv").resolve()
+    (tmp_path / ".env").write_text(f"DATASET_PATH={tmp_path / 'stale.csv'}\n", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+
+    # Set by the process (e.g. a scheduler): wins over the stale .env value
+    monkeypatch.setenv("DATASET_PATH", str(dataset))
+    assert main(["execute", "--rule-based"]) == 0
+    result = json.loads(capsys.readouterr().out)
+    assert result["evidence"]["kpis"]["sessions"]["current"] >= 0
+
+    # Not set by the process: taken from .env (load_dotenv sets it; restored afterwards)
+    monkeypatch.delenv("DATASET_PATH")
+    (tmp_path / ".env").write_text(f"DATASET_PATH={dataset}\n", encoding="utf-8")
+    assert main(["execute", "--rule-based"]) == 0
+    assert os.environ["DATASET_PATH"] == str(dataset)
@@ -0,0 +1,88 @@
+import json
+import os
+import subprocess
+import sys
+
+from app.config import settings
+from app.llm_client import get_client
+from loadtest.driver import main, run_load, percentile
+from loadtest.stub_server import StubConfig, LatencySpec, start_in_thread
+
+
+def test_get_client_honours_base_url(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "stub-key")
+    client = get_client(base_url="http://127.0.0.1:9/v1")
+    assert str(client.base_url).startswith("http://127.0.0.1:9/v1")
+
+
+def test_latency_spec_parse():
+    assert LatencySpec.parse("fixed:5") == LatencySpec("fixed", 5.0)
+    assert LatencySpec.parse("uniform:1:3").kind == "uniform"
+    assert percentile([3.0, 1.0, 2.0], 50) == 2.0
+
+
+def test_load_against_stub(monkeypatch):
+    srv = start_in_thread(StubConfig(planner_latency=LatencySpec("fixed", 1.0), seed=0))
+    try:
+        monkeypatch.setenv("OPENAI_API_KEY", "stub-key")
+        monkeypatch.setenv("OPENAI_BASE_URL", srv.base_url)
+        samples, report = run_load(["Why did conversion drop last week?"], "data/sample_events.csv", concurrency=2, requests=4)
+    finally:
+        srv.shutdown()
+        srv.server_close()
+
+    assert report["requests"] == 4
+    assert report["errors"] == 0
+    assert report["planner_fallback_rate"] == 0.0
+    assert report["narrator_fallback_rate"] == 0.0
+    assert report["latency"]["total"]["p99_ms"] is not None
+
+
+def test_load_against_stub_counts_fallbacks(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "stub-key")
+    monkeypatch.setattr(settings, "openai_max_retries", 0)
+
+    # Every planner reply malformed, no HTTP errors: planner falls back, narrator does not
+    srv = start_in_thread(StubConfig(malformed_rate=1.0, seed=0))
+    try:
+        monkeypatch.setenv("OPENAI_BASE_URL", srv.base_url)
+        _, report = run_load(["Why did conversion drop last week?"], "data/sample_events.csv", concurrency=2, requests=4)
+        counts = srv.state.snapshot()
+    finally:
+        srv.shutdown()
+        srv.server_close()
+    assert report["planner_fallback_rate"] == 1.0
+    assert report["narrator_fallback_rate"] == 0.0
+    assert counts == {"requests": 8, "errors": 0, "malformed": 4}
+
+    # Every call answered with HTTP 500 and no SDK retries: both stages fall back
+    srv = start_in_thread(StubConfig(error_rate=1.0, seed=0))
+    try:
+        monkeypatch.setenv("OPENAI_BASE_URL", srv.base_url)
+        _, report = run_load(["Why did conversion drop last week?"], "data/sample_events.csv", concurrency=2, requests=4)
+        counts = srv.state.snapshot()
+    finally:
+        srv.shutdown()
+        srv.server_close()
+    assert report["errors"] == 0
+    assert report["planner_fallback_rate"] == 1.0
+    assert report["narrator_fallback_rate"] == 1.0
+    assert counts == {"requests": 8, "errors": 8, "malformed": 0}
+
+
+def test_driver_reports_stub_counts(capsys, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "stub-key")
+    # main() sets these; registering them here restores them afterwards
+    monkeypatch.setenv("OPENAI_BASE_URL", "")
+    monkeypatch.setattr(settings, "openai_max_retries", None)
+    main(["--spawn-stub", "--error-rate", "1.0", "--max-retries", "0", "--requests", "2", "--json"])
+    report = json.loads(capsys.readouterr().out)["report"]
+    assert report["max_retries"] == 0
+    assert report["stub"]["errors"] == report["stub"]["requests"] == 4
+
+
+def test_invalid_max_retries_is_a_configuration_error():
+    env = {**os.environ, "OPENAI_MAX_RETRIES": "abc"}
+    out = subprocess.run([sys.executable, "-c", "import app.config"], env=env, capture_output=True, text=True)
+    assert out.returncode != 0
+    assert "OPENAI_MAX_RETRIES must be a non-negative integer" in out.stderr
@@ -0,0 +1,147 @@
+import itertools
+
+import pandas as pd
+
+from app import tools
+from app.executor import execute_plan
+from app.planner_llm import rule_based_plan
+from app.result_store import ResultStore, reanalyze
+
+QUESTION = "Why did conversion drop last week?"
+COLUMNS = ["date", "sessions", "conversions", "step_view_product", "step_add_to_cart",
+           "step_checkout", "step_purchase", "device", "channel", "country"]
+
+
+def _rows(days):
+    rows = []
+    combos = itertools.product(["desktop", "mobile"], ["paid_search", "email"], ["US", "DE"])
+    combos = list(combos)
+    for d in days:
+        for i, (device, channel, country) in enumerate(combos):
+            sessions = 500 + 37 * i + 11 * d.day
+            conv = 10 + (i * 3 + d.day) % 17
+            rows.append([d.strftime("%Y-%m-%d"), sessions, conv, sessions // 2, sessions // 5,
+                         sessions // 9, conv, device, channel, country])
+    return rows
+
+
+def _write(path, rows, header=True, mode="w"):
+    with open(path, mode, encoding="utf-8") as f:
+        if header:
+            f.write(",".join(COLUMNS) + "\n")
+        for r in rows:
+            f.write(",".join(str(v) for v in r) + "\n")
+
+
+def _full(plan, path):
+    return execute_plan(plan, tools.load_dataset(str(path)))
+
+
+def test_delta_reanalysis_matches_full_recompute(tmp_path, monkeypatch):
+    days = list(pd.date_range("2025-06-01", periods=40, freq="D"))
+    path = tmp_path / "events.csv"
+    _write(path, _rows(days[:30]))
+
+    plan = rule_based_plan(QUESTION)
+    store = ResultStore(str(tmp_path / "store"))
+    first = reanalyze(plan, str(path), store)
+    assert first.model_dump_json() == _full(plan, path).model_dump_json()
+
+    reads = []
+    real = tools.load_dataset_rows
+
+    def spy(p, start=None, end=None, **kwargs):
+        reads.append((start, end))
+        return real(p, start, end, **kwargs)
+
+    monkeypatch.setattr(tools, "load_dataset_rows", spy)
+
+    # Unchanged dataset: nothing is read
+    assert reanalyze(plan, str(path), store).model_dump_json() == first.model_dump_json()
+    assert reads == []
+
+    for chunk in (days[30:31], days[31:40]):
+        size_before = path.stat().st_size
+        _write(path, _rows(chunk), header=False, mode="a")
+        # Fresh store instance: aggregates are loaded back from disk
+        result = reanalyze(plan, str(path), ResultStore(str(tmp_path / "store")))
+        assert reads[-1] == (size_before, path.stat().st_size)
+        assert result.model_dump_json() == _full(plan, path).model_dump_json()
+
+
+def test_delta_reanalysis_with_tz_aware_dates(tmp_path):
+    days = list(pd.date_range("2025-06-01", periods=30, freq="D"))
+    path = tmp_path / "events.csv"
+
+    def rows(ds):
+        return [[r[0] + "T00:00:00+00:00"] + r[1:] for r in _rows(ds)]
+
+    _write(path, rows(days[:25]))
+    plan = rule_based_plan(QUESTION)
+    reanalyze(plan, str(path), ResultStore(str(tmp_path / "store")))
+
+    _write(path, rows(days[25:]), header=False, mode="a")
+    # Fresh store instance: the cube's dates come back from JSON
+    result = reanalyze(plan, str(path), ResultStore(str(tmp_path / "store")))
+    assert result.model_dump_json() == _full(plan, path).model_dump_json()
+
+
+def test_edited_dataset_falls_back_to_full_recompute(tmp_path):
+    days = list(pd.date_range("2025-06-01", periods=20, freq="D"))
+    path = tmp_path / "events.csv"
+    _write(path, _rows(days))
+
+    plan = rule_based_plan(QUESTION)
+    store = ResultStore()
+    reanalyze(plan, str(path), store)
+
+    rows = _rows(days)
+    rows[0][1] = 1  # rewrite history instead of appending
+    _write(path, rows + _rows([days[-1] + pd.Timedelta(days=1)]))
+    assert reanalyze(plan, str(path), store).model_dump_json() == _full(plan, path).model_dump_json()
+
+
+def test_delta_with_quoted_bom_header_and_numeric_looking_segment(tmp_path):
+    days = list(pd.date_range("2025-06-01", periods=20, freq="D"))
+    path = tmp_path / "events.csv"
+
+    def rows(ds):
+        # "DE" becomes "49": a string column whose appended chunk looks all-numeric
+        return [r[:-1] + ["49" if r[-1] == "DE" else r[-1]] for r in _rows(ds)]
+
+    with open(path, "w", encoding="utf-8-sig") as f:
+        f.write(",".join(f'"{c}"' for c in COLUMNS) + "\n")  # quoted header after a BOM
+    _write(path, rows(days[:15]), header=False, mode="a")
+
+    plan = rule_based_plan(QUESTION)
+    store = ResultStore()
+    reanalyze(plan, str(path), store)
+
+    _write(path, [r for r in rows(days[15:]) if r[-1] == "49"], header=False, mode="a")
+    result = reanalyze(plan, str(path), store)
+    assert result.model_dump_json() == _full(plan, path).model_dump_json()
+    assert len(result.evidence.segments["country"]["rows"]) == 2
+
+
+def test_same_width_mid_file_edit_detected_with_verify_prefix(tmp_path):
+    days = list(pd.date_range("2024-01-01", periods=431, freq="D"))
+    path = tmp_path / "events.csv"
+    _write(path, _rows(days[:430]))
+    assert path.stat().st_size > 2 * 64 * 1024  # edit lands outside the head/tail blocks
+
+    plan = rule_based_plan(QUESTION)
+    store = ResultStore(verify_prefix=True)
+    reanalyze(plan, str(path), store)
+
+    # Same byte length: "577" -> "-77"
+    lines = path.read_bytes().split(b"\n")
+    k = len(lines) // 2
+    fields = lines[k].split(b",")
+    fields[1] = b"-" + fields[1][1:]
+    lines[k] = b",".join(fields)
+    path.write_bytes(b"\n".join(lines))
+    _write(path, _rows(days[430:]), header=False, mode="a")
+
+    result = reanalyze(plan, str(path), store)
+    assert result.evidence.sanity["negative_values"]["sessions"] == 1
+    assert result.model_dump_json() == _full(plan, path).model_dump_json()